@@ -1,15 +1,120 @@
+import os
+import re
+import sys
+import argparse
 import requests
+import requests_cache
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import pandas as pd
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+except ImportError:  # Optional - pandas' own writers are used without it
+    pa = None
 import matplotlib.pyplot as plt
 import time
+import threading
 from collections import defaultdict
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+# Leading labels of notices about another work (retractions, corrections, peer-review records)
+_NOTICE_LABELS = ('retraction notice|retraction note|retraction|retracted article|retracted|corrigendum|'
+                  'erratum|author correction|correction|expression of concern|editorial|appendix|'
+                  'decision letter|decision|review|recommendation|author response|author comment|'
+                  'commentary|comment|reply|rebuttal')
+_NOTICE_PREFIX = re.compile(
+    r'^(?:\s*(?:(?:%s)(?:\s+(?:to|for|of|on))?(?:\s*:|\s+-\s)'
+    r'|(?:retraction notice|retraction note|corrigendum|erratum|correction|expression of concern'
+    r'|decision letter|review|author response|commentary|comment|reply|rebuttal)\s+(?:to|for)\s'
+    r'|(?:commentary|comment)\s+on\s)\s*)+' % _NOTICE_LABELS,
+    re.IGNORECASE
+)
 
 class OpenAlexEnergyHubCollector:
-    def __init__(self, email="your.email@domain.com"):
-        self.base_url = "https://api.openalex.org/"
+    base_url = "https://api.openalex.org/"
+    works_url = base_url + "works"
+    
+    # Only fetch the fields we use - full work records are much larger
+    works_select = ('id,display_name,publication_year,doi,cited_by_count,open_access,'
+                    'primary_location,authorships,abstract_inverted_index')
+    abstract_select = 'id,display_name,publication_year,cited_by_count'
+    
+    # Terms are OR-ed together ('a|b|c') so one query covers many of them
+    max_terms_per_query = 25
+    
+    # Near-duplicate detection: title shingle size (words) and the Jaccard similarity
+    # of two titles' shingle sets at which they count as the same work
+    dedup_ngram_size = 3
+    dedup_threshold = 0.85
+    
+    # Rows serialized per batch by the CSV writer (pyarrow's default is 1024)
+    csv_batch_rows = 10_000
+    
+    # OpenAlex work fields (flattened) -> paper DataFrame columns
+    work_columns = {
+        'id': 'id',
+        'display_name': 'title',
+        'publication_year': 'year',
+        'doi': 'doi',
+        'cited_by_count': 'citation_count',
+        'open_access.is_oa': 'open_access',
+        'primary_location.source.display_name': 'venue',
+        'authorships': 'authors'
+    }
+    
+    def __init__(self, email="your.email@domain.com", max_workers=10, requests_per_second=10,
+                 use_cache=True):
         self.email = email
-        self.papers = []
+        self.papers = pd.DataFrame()
+        
+        # Annual summary cache, valid while self.papers is the frame it was built from
+        self._summary_for = None
+        self._tracked = None
+        self._summary_df = None
+        
+        # Concurrency settings - OpenAlex allows up to 10 requests per second
+        self.max_workers = max_workers
+        self.min_request_interval = 1.0 / requests_per_second
+        self._rate_lock = threading.Lock()
+        self._last_request_time = 0.0
+        
+        # One pooled session so every request after the first reuses the TLS connection.
+        # Responses are also cached on disk so re-runs skip the network.
+        if use_cache:
+            self.session = requests_cache.CachedSession(
+                'openalex_cache',
+                backend='sqlite',
+                expire_after=timedelta(days=7),
+                allowable_methods=('GET',)
+            )
+        else:
+            self.session = requests.Session()
+        # Keep one pooled connection per worker thread so parallel searches never
+        # have to open (and then discard) connections beyond the pool
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max(self.max_workers, 1),
+            pool_block=True,
+            # Rate limits (429) and server errors are retried with jittered exponential
+            # backoff, honoring OpenAlex's Retry-After header when it is sent.
+            # backoff_jitter needs urllib3>=2. These retries happen inside session.get,
+            # so they are not paced by _throttle; the backoff sleep spaces them instead.
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.5,
+                backoff_jitter=1.0,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=['GET'],
+                respect_retry_after_header=True,
+                raise_on_status=False  # Return the last error response so callers can report it
+            )
+        )
+        self.session.mount('https://', adapter)
         
         # Energy hub search terms - optimized for OpenAlex
         self.search_terms = {
@@ -29,175 +134,226 @@ class OpenAlexEnergyHubCollector:
             ]
         }
     
-    def search_works(self, search_query, category, year_start=2004, year_end=2025):
+    def _throttle(self):
+        """Space out requests from all worker threads to stay under the rate limit"""
+        with self._rate_lock:
+            wait = self._last_request_time + self.min_request_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_request_time = time.monotonic()
+    
+    def _term_category(self, term):
+        """Look up which category ('core' or 'related') a search term belongs to"""
+        for category, terms in self.search_terms.items():
+            if term in terms:
+                return category
+        return 'unknown'
+    
+    def _match_search_term(self, title, terms, abstract=''):
+        """
+        Recover which of several OR-ed search terms a work matched
+        The title is checked first, then the abstract. Terms are tried in
+        order, so earlier (core) terms win ties. Returns None when no term
+        can be found in either text (a single-term query is its own match).
+        """
+        # OpenAlex search is tokenized (hyphens split words), stemmed and word-order independent
+        term_words = [re.findall(r'\w+', term.lower()) for term in terms]
+        for text in (title, abstract):
+            text = (text or '').lower()
+            if not text:
+                continue
+            # Whole words only, so 'hub' does not match 'Hubei' or 'Github'
+            text_words = re.findall(r'\w+', text)
+            text_word_set = set(text_words)
+            phrase = ' %s ' % ' '.join(text_words)
+            for term, words in zip(terms, term_words):
+                if ' %s ' % ' '.join(words) in phrase:
+                    return term
+            for term, words in zip(terms, term_words):
+                if all(word in text_word_set for word in words):
+                    return term
+            for term, words in zip(terms, term_words):
+                # Loose stem match: 'integrated' ~ 'integrating', 'energy' ~ 'energies';
+                # short words only take a plural 's' ('hub' ~ 'hubs')
+                if all(word in text_word_set or word + 's' in text_word_set
+                       or (len(word) > 4 and any(tw.startswith(word[:max(4, len(word) - 3)]) for tw in text_words))
+                       for word in words):
+                    return term
+        return terms[0] if len(terms) == 1 else None
+    
+    def _reconstruct_abstract(self, inverted):
+        """
+        Rebuild abstract text from an OpenAlex abstract_inverted_index
+        ({word: [positions]}) by ordering every word occurrence by position
+        """
+        occurrences = [(word, pos) for word, poss in (inverted or {}).items() for pos in poss]
+        if not occurrences:
+            return ''
+        words, positions = zip(*occurrences)
+        order = np.argsort(positions, kind='stable')
+        return ' '.join(np.asarray(words)[order])
+    
+    def _works_to_frame(self, works, terms, category, source):
+        """
+        Convert raw OpenAlex work records into the collector's paper DataFrame
+        Nested fields are flattened in one json_normalize pass instead of per work
+        """
+        # Rebuild abstracts up front and drop the inverted indexes - they are by far the
+        # largest field and would otherwise be flattened into one column per word
+        abstracts = [self._reconstruct_abstract(work.pop('abstract_inverted_index', None)) for work in works]
+        
+        df = pd.json_normalize(works, max_level=2)
+        df = df.reindex(columns=list(self.work_columns)).rename(columns=self.work_columns)
+        
+        df['title'] = df['title'].fillna('')
+        df['citation_count'] = df['citation_count'].fillna(0)
+        df['open_access'] = df['open_access'].fillna(False)
+        df['venue'] = df['venue'].fillna('')
+        df['authors'] = df['authors'].map(
+            lambda authorships: [a['author'].get('display_name', '')
+                                 for a in authorships[:10] if a.get('author')]  # First 10 authors
+            if isinstance(authorships, list) else []
+        )
+        df['abstract'] = abstracts
+        df['search_term'] = [self._match_search_term(title, terms, abstract)
+                             for title, abstract in zip(df['title'], abstracts)]
+        df['category'] = category or df['search_term'].map(self._term_category)
+        df['source'] = source
+        
+        # No year re-check here - the publication_year filter sent to OpenAlex is authoritative
+        # Arrow-backed columns (when pyarrow is installed) so groupbys and CSV writes run on Arrow kernels
+        dtypes = {column: 'string' for column in ['id', 'title', 'doi', 'venue', 'abstract',
+                                                  'search_term', 'category', 'source']}
+        dtypes.update({'year': 'Int32', 'citation_count': 'Int32', 'open_access': 'boolean'})
+        df = df.astype(dtypes)
+        return df.convert_dtypes(dtype_backend='pyarrow') if pa is not None else df
+    
+    def search_works(self, search_query, category=None, year_start=2020, year_end=2025):
         """
         Search OpenAlex for works using their powerful search capabilities
         Based on official OpenAlex documentation and tutorials
+        
+        search_query may be a single term or a list of terms, which are
+        combined into one OR query. When category is None each work is
+        tagged with the category of the term it matched.
         """
-        print(f"🔍 Searching OpenAlex for: '{search_query}' ({category})")
+        terms = [search_query] if isinstance(search_query, str) else list(search_query)
+        query = '|'.join(terms)
+        print(f"🔍 Searching OpenAlex for: '{query}' ({category or 'by term'})")
         
         # Build filters - OpenAlex format
         filters = [
             f"publication_year:{year_start}-{year_end}",
-            f"title.search:{search_query}"  # Search in title for better precision
+            f"title.search:{query}"  # Search in title for better precision
         ]
         
-        # Construct URL
-        endpoint = "works"
-        params = {
+        base_params = {
             'filter': ','.join(filters),
             'per-page': 200,  # Max per request
-            'sort': 'publication_date:desc',
+            'select': self.works_select,
             'mailto': self.email
         }
         
-        all_papers = []
-        page = 1
+        works = []
+        cursor = '*'  # Cursor paging keeps deep pages cheap and has no 10k cap
         
         try:
-            while True:
-                # Add page parameter
-                params['page'] = page
-                
-                # Make request
-                response = requests.get(self.base_url + endpoint, params=params, timeout=30)
+            while cursor:
+                # Make request - only the cursor changes between pages
+                self._throttle()
+                response = self.session.get(self.works_url, params={**base_params, 'cursor': cursor}, timeout=30)
                 
+                # Transient errors were already retried by the session adapter
                 if response.status_code != 200:
                     print(f"   ❌ Error {response.status_code}: {response.text}")
+                    print(f"   ⚠️ Stopping early - results for '{query}' are incomplete")
                     break
                 
-                data = response.json()
+                data = orjson.loads(response.content)
                 results = data.get('results', [])
                 
                 if not results:
                     break
                 
-                # Process results
-                for work in results:
-                    paper = {
-                        'id': work.get('id', ''),
-                        'title': work.get('display_name', ''),
-                        'year': work.get('publication_year'),
-                        'doi': work.get('doi'),
-                        'citation_count': work.get('cited_by_count', 0),
-                        'open_access': work.get('open_access', {}).get('is_oa', False),
-                        'venue': '',
-                        'authors': [],
-                        'abstract_inverted': work.get('abstract_inverted_index', {}),
-                        'search_term': search_query,
-                        'category': category,
-                        'source': 'openalex'
-                    }
-                    
-                    # Extract venue information
-                    primary_location = work.get('primary_location', {})
-                    if primary_location:
-                        source = primary_location.get('source', {})
-                        if source:
-                            paper['venue'] = source.get('display_name', '')
-                    
-                    # Extract author information
-                    authorships = work.get('authorships', [])
-                    for authorship in authorships[:10]:  # Limit to first 10 authors
-                        author = authorship.get('author', {})
-                        if author:
-                            paper['authors'].append({
-                                'name': author.get('display_name', ''),
-                                'orcid': author.get('orcid')
-                            })
-                    
-                    # Only include papers from our target years
-                    if paper['year'] and 2020 <= paper['year'] <= 2025:
-                        all_papers.append(paper)
-                
-                # Check if we have more pages
-                meta = data.get('meta', {})
-                if page >= meta.get('count', 0) / params['per-page']:
-                    break
-                
-                page += 1
-                time.sleep(0.1)  # Be respectful to the API
+                works.extend(results)
                 
-                # Safety limit
-                if page > 10:  # Max 2000 papers per search term
-                    break
+                # Next cursor is None once the last page has been returned
+                cursor = data.get('meta', {}).get('next_cursor')
         
         except Exception as e:
             print(f"   ❌ Exception: {e}")
         
+        all_papers = self._works_to_frame(works, terms, category, 'openalex')
         print(f"   ✅ Found {len(all_papers)} papers")
         return all_papers
     
     def search_by_abstract(self, search_query, category, year_start=2020, year_end=2025):
         """
         Alternative search using abstract field for broader coverage
+        Accepts a single term or a list of terms combined into one OR query
         """
-        print(f"🔍 Abstract search for: '{search_query}' ({category})")
+        terms = [search_query] if isinstance(search_query, str) else list(search_query)
+        query = '|'.join(terms)
+        print(f"🔍 Abstract search for: '{query}' ({category})")
         
         filters = [
             f"publication_year:{year_start}-{year_end}",
-            f"abstract.search:{search_query}"
+            f"abstract.search:{query}"
         ]
         
         params = {
             'filter': ','.join(filters),
             'per-page': 100,
             'sort': 'cited_by_count:desc',  # Get most cited first
+            'select': self.abstract_select,
             'mailto': self.email
         }
         
         try:
-            response = requests.get(self.base_url + "works", params=params, timeout=30)
+            self._throttle()
+            response = self.session.get(self.works_url, params=params, timeout=30)
             if response.status_code == 200:
-                data = response.json()
-                results = data.get('results', [])
-                
-                papers = []
-                for work in results:
-                    if work.get('publication_year') and 2020 <= work.get('publication_year') <= 2025:
-                        paper = {
-                            'id': work.get('id', ''),
-                            'title': work.get('display_name', ''),
-                            'year': work.get('publication_year'),
-                            'citation_count': work.get('cited_by_count', 0),
-                            'search_term': search_query,
-                            'category': category,
-                            'source': 'openalex_abstract'
-                        }
-                        papers.append(paper)
+                data = orjson.loads(response.content)
+                papers = self._works_to_frame(data.get('results', []), terms, category, 'openalex_abstract')
                 
                 print(f"   ✅ Found {len(papers)} papers via abstract search")
                 return papers
+            print(f"   ❌ Error {response.status_code}: {response.text}")
         
         except Exception as e:
             print(f"   ❌ Exception: {e}")
         
-        return []
+        return self._works_to_frame([], terms, category, 'openalex_abstract')
     
     def collect_all_papers(self):
         """
         Collect papers using multiple search strategies
+        
+        Search terms are batched into OR queries and all queries run
+        concurrently on a thread pool; request pacing is handled by _throttle.
         """
         print("🚀 Starting OpenAlex Collection...")
         print("=" * 50)
         
-        all_papers = []
-        
-        # Strategy 1: Title search (most precise)
-        print("📖 Strategy 1: Title-based search")
-        for category, terms in self.search_terms.items():
-            for term in terms:
-                papers = self.search_works(term, category)
-                all_papers.extend(papers)
-                time.sleep(1)
+        # Strategy 1: Title search (most precise), core terms first so they win ties
+        all_terms = [term for terms in self.search_terms.values() for term in terms]
+        size = self.max_terms_per_query
+        searches = [
+            (self.search_works, all_terms[i:i + size], None)
+            for i in range(0, len(all_terms), size)
+        ]
         
-        # Strategy 2: Abstract search for broader coverage
-        print(f"\n📄 Strategy 2: Abstract-based search")
+        # Strategy 2: Abstract search for broader coverage - one request per term, since each
+        # returns only the top 100 most-cited hits and an OR query would share that cap
         key_terms = ['energy hub', 'multi-energy system', 'integrated energy system']
-        for term in key_terms:
-            papers = self.search_by_abstract(term, 'related')
-            all_papers.extend(papers)
-            time.sleep(1)
+        searches.extend((self.search_by_abstract, term, 'related') for term in key_terms)
+        
+        print(f"📖 Running {len(searches)} title and abstract queries in parallel")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(lambda s: s[0](s[1], s[2]), searches))
+        
+        # Keep the original strategy order so deduplication prefers title hits
+        all_papers = pd.concat(results, ignore_index=True)
         
         # Remove duplicates
         print(f"\n🔧 Removing duplicates from {len(all_papers)} papers...")
@@ -212,104 +368,129 @@ class OpenAlexEnergyHubCollector:
     def remove_duplicates(self, papers):
         """
         Remove duplicates using multiple criteria
+        
+        Exact duplicates are dropped by OpenAlex ID. Each remaining title is
+        then split into word shingles (dedup_ngram_size words, normalized) and
+        compared with every earlier kept title it shares a shingle with; when
+        the Jaccard similarity of the two shingle sets reaches dedup_threshold
+        the papers are the same work (e.g. a preprint and its journal version).
+        Notice labels such as "Retraction notice to" or "Corrigendum:" are
+        stripped before comparing, and when a notice and the article it refers
+        to match, the article is kept whichever came first; notices with
+        different labels are never merged with each other.
+        Both checks happen in a single pass over the papers.
         """
-        unique_papers = []
-        seen_ids = set()
-        seen_titles = set()
+        if papers.empty:
+            return papers.reset_index(drop=True)
+        
+        ids = papers['id'].fillna('').astype(str)
+        titles = papers['title'].fillna('').astype(str)
+        # Notice label of each title ('' for articles), e.g. 'retraction notice to'
+        notices = titles.str.extract('(' + _NOTICE_PREFIX.pattern + ')', flags=re.IGNORECASE)[0] \
+            .fillna('').str.lower().str.findall(r'[a-z]+').str.join(' ').tolist()
+        # Drop notice labels and markup, lowercase, strip punctuation and collapse whitespace
+        tokens = titles.str.replace(_NOTICE_PREFIX, '', regex=True) \
+            .str.replace(r'<[^>]*>|&lt;.*?&gt;|&\w+;', ' ', regex=True) \
+            .str.lower().str.replace(r'[^\w\s]', ' ', regex=True).str.split()
         
-        for paper in papers:
-            # Use OpenAlex ID as primary deduplication
-            paper_id = paper.get('id', '')
-            title = str(paper.get('title', '')).lower().strip()
-            
-            if paper_id and paper_id not in seen_ids:
+        seen_ids = set()
+        kept_shingles = {}  # position -> shingle set, for titles currently kept
+        index = defaultdict(set)  # shingle -> positions of kept titles containing it
+        keep = [True] * len(papers)
+        n = self.dedup_ngram_size
+        for pos, (paper_id, words) in enumerate(zip(ids, tokens)):
+            # Use OpenAlex ID as primary deduplication (papers without one always pass)
+            if paper_id:
+                if paper_id in seen_ids:
+                    keep[pos] = False
+                    continue
                 seen_ids.add(paper_id)
-                unique_papers.append(paper)
-            elif title and title not in seen_titles:
-                seen_titles.add(title)
-                unique_papers.append(paper)
+            if not words:
+                continue
+            shingles = {' '.join(words[i:i + n]) for i in range(max(len(words) - n + 1, 1))}
+            
+            # Similarity is always between two single titles - shingles are never pooled
+            shared = defaultdict(int)
+            for shingle in shingles:
+                for other in index.get(shingle, ()):
+                    shared[other] += 1
+            # Two different notices about the same article (a comment and its reply) are separate works
+            matches = [other for other, count in shared.items()
+                       if count / (len(shingles) + len(kept_shingles[other]) - count) >= self.dedup_threshold
+                       and (not notices[pos] or not notices[other] or notices[pos] == notices[other])]
+            
+            if matches:
+                if notices[pos] or not all(notices[other] for other in matches):
+                    keep[pos] = False
+                    continue
+                # Only notices about this article were kept so far - keep the article instead
+                for other in matches:
+                    keep[other] = False
+                    for shingle in kept_shingles.pop(other):
+                        index[shingle].discard(other)
+            
+            kept_shingles[pos] = shingles
+            for shingle in shingles:
+                index[shingle].add(pos)
         
-        return unique_papers
+        return papers.loc[keep].reset_index(drop=True)
     
     def print_summary(self):
         """Print collection summary"""
-        if not self.papers:
+        if self.papers.empty:
             return
         
         print(f"\n📊 OPENALEX COLLECTION SUMMARY:")
         print("-" * 40)
         
-        # By category
-        category_counts = defaultdict(int)
-        year_counts = defaultdict(int)
-        citation_stats = []
-        
-        for paper in self.papers:
-            category_counts[paper.get('category', 'unknown')] += 1
-            year = paper.get('year')
-            if year:
-                year_counts[year] += 1
-            
-            citations = paper.get('citation_count', 0)
-            if isinstance(citations, (int, float)):
-                citation_stats.append(citations)
+        category_counts = self.papers.groupby('category').size()
+        year_counts = self.papers.groupby('year').size()
+        citation_stats = self.papers['citation_count'].describe()
         
         print("By Category:")
-        for cat, count in sorted(category_counts.items()):
+        for cat, count in category_counts.items():
             print(f"  {cat:15s}: {count:3d} papers")
         
         print(f"\nBy Year:")
-        for year in sorted(year_counts.keys()):
-            print(f"  {year}: {year_counts[year]:3d} papers")
+        for year, count in year_counts.items():
+            print(f"  {year}: {count:3d} papers")
         
-        if citation_stats:
-            avg_citations = sum(citation_stats) / len(citation_stats)
-            print(f"\nCitation Statistics:")
-            print(f"  Average citations: {avg_citations:.1f}")
-            print(f"  Max citations: {max(citation_stats)}")
-            print(f"  Papers with >10 citations: {sum(1 for c in citation_stats if c > 10)}")
+        print(f"\nCitation Statistics:")
+        print(f"  Average citations: {citation_stats['mean']:.1f}")
+        print(f"  Max citations: {citation_stats['max']:.0f}")
+        print(f"  Papers with >10 citations: {(self.papers['citation_count'] > 10).sum()}")
     
     def create_visualization(self):
         """Create simple visualization of the results"""
-        if not self.papers:
+        if self.papers.empty:
             print("❌ No data to visualize")
             return
         
         # Prepare data
-        year_counts = defaultdict(int)
-        category_counts = defaultdict(int)
-        
-        for paper in self.papers:
-            year = paper.get('year')
-            if year and 2020 <= year <= 2025:
-                year_counts[year] += 1
-                category_counts[paper.get('category', 'unknown')] += 1
+        papers = self.papers[self.papers['year'].between(2020, 2025)]
+        year_counts = papers['year'].value_counts().sort_index()
+        category_counts = papers['category'].value_counts(sort=False)
         
         # Create visualization
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
         fig.suptitle('Energy Hub Research from OpenAlex (2020-2025)', fontsize=16, fontweight='bold')
         
         # Plot 1: Papers by year
-        years = sorted(year_counts.keys())
-        counts = [year_counts[year] for year in years]
-        
-        bars = ax1.bar(years, counts, color='steelblue', alpha=0.8, edgecolor='navy')
+        bars = ax1.bar(year_counts.index, year_counts.values, color='steelblue', alpha=0.8, edgecolor='navy')
         ax1.set_title('Publications per Year', fontweight='bold')
         ax1.set_xlabel('Year')
         ax1.set_ylabel('Number of Papers')
         ax1.grid(True, alpha=0.3)
         
         # Add value labels
-        for bar, count in zip(bars, counts):
+        for bar, count in zip(bars, year_counts.values):
             ax1.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 1,
                     str(count), ha='center', va='bottom', fontweight='bold')
         
         # Plot 2: Category distribution
-        categories = list(category_counts.keys())
-        cat_counts = list(category_counts.values())
-        colors = ['#2E8B57', '#FF6B35', '#4169E1'][:len(categories)]
+        colors = ['#2E8B57', '#FF6B35', '#4169E1'][:len(category_counts)]
         
-        wedges, texts, autotexts = ax2.pie(cat_counts, labels=categories, colors=colors,
+        wedges, texts, autotexts = ax2.pie(category_counts.values, labels=category_counts.index, colors=colors,
                                           autopct='%1.1f%%', startangle=90)
         ax2.set_title('Research Category Distribution', fontweight='bold')
         
@@ -319,53 +500,58 @@ class OpenAlexEnergyHubCollector:
         
         print(f"📊 Visualization saved as: openalex_energy_hub_analysis.png")
     
-    def save_to_csv(self, filename='openalex_energy_hub_papers.csv'):
-        """Save papers to CSV"""
-        if not self.papers:
+    def _write_table(self, df, filename, format='csv'):
+        """
+        Write a DataFrame with pyarrow's multi-threaded writers
+        (CSV falls back to pandas when pyarrow is not installed)
+        format='parquet' writes a .parquet file next to the requested CSV name
+        and requires pyarrow
+        Returns the filename actually written
+        """
+        if format == 'parquet':
+            if pa is None:
+                raise ImportError("Parquet output requires pyarrow: pip install pyarrow")
+            filename = os.path.splitext(filename)[0] + '.parquet'
+        
+        if pa is None:
+            df.to_csv(filename, index=False, chunksize=self.csv_batch_rows)
+            return filename
+        
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if format == 'parquet':
+            pq.write_table(table, filename)
+        else:
+            pacsv.write_csv(table, filename,
+                            write_options=pacsv.WriteOptions(batch_size=self.csv_batch_rows))
+        return filename
+    
+    def save_to_csv(self, filename='openalex_energy_hub_papers.csv', format='csv'):
+        """Save papers to CSV (or Parquet with format='parquet')"""
+        if self.papers.empty:
             print("❌ No data to save")
             return
         
         # Prepare data for CSV
-        csv_data = []
-        for paper in self.papers:
-            # Handle authors
-            authors = paper.get('authors', [])
-            author_names = '; '.join([author.get('name', '') for author in authors])
-            
-            # Reconstruct abstract from inverted index (simplified)
-            abstract_inverted = paper.get('abstract_inverted', {})
-            abstract_text = ""
-            if abstract_inverted:
-                # Simple reconstruction - full implementation would sort by position
-                words = list(abstract_inverted.keys())[:50]  # First 50 words
-                abstract_text = ' '.join(words)
-            
-            row = {
-                'openalex_id': paper.get('id', ''),
-                'title': paper.get('title', ''),
-                'year': paper.get('year', ''),
-                'authors': author_names,
-                'venue': paper.get('venue', ''),
-                'doi': paper.get('doi', ''),
-                'citation_count': paper.get('citation_count', 0),
-                'open_access': paper.get('open_access', False),
-                'abstract_sample': abstract_text,
-                'search_term': paper.get('search_term', ''),
-                'category': paper.get('category', ''),
-                'source_strategy': paper.get('source', '')
-            }
-            csv_data.append(row)
-        
-        # Save to CSV
-        df = pd.DataFrame(csv_data)
-        
-        # Clean data
-        df = df[df['year'] != '']
-        df['year'] = pd.to_numeric(df['year'], errors='coerce')
-        df = df.dropna(subset=['year'])
-        df = df[(df['year'] >= 2020) & (df['year'] <= 2025)]
-        
-        df.to_csv(filename, index=False, encoding='utf-8')
+        papers = self.papers
+        
+        abstract_text = papers['abstract'].map(lambda text: ' '.join(text.split()[:50]))  # First 50 words
+        
+        df = pd.DataFrame({
+            'openalex_id': papers['id'],
+            'title': papers['title'],
+            'year': papers['year'],
+            'authors': papers['authors'].map('; '.join),
+            'venue': papers['venue'],
+            'doi': papers['doi'],
+            'citation_count': papers['citation_count'],
+            'open_access': papers['open_access'],
+            'abstract_sample': abstract_text,
+            'search_term': papers['search_term'],
+            'category': papers['category'],
+            'source_strategy': papers['source']
+        })
+        
+        filename = self._write_table(df, filename, format)
         
         print(f"\n📄 CSV EXPORT COMPLETE:")
         print(f"   File: {filename}")
@@ -376,140 +562,109 @@ class OpenAlexEnergyHubCollector:
         
         return df
     
-    def save_annual_summary_csvs(self):
+    def _detail_frame(self, papers):
+        """Per-paper detail rows used by the annual summary CSVs"""
+        return pd.DataFrame({
+            'year': papers['year'],
+            'title': papers['title'],
+            'authors': papers['authors'].map(lambda authors: '; '.join(authors[:5])),  # First 5 authors
+            'venue': papers['venue'],
+            'citation_count': papers['citation_count'],
+            'open_access': papers['open_access'],
+            'doi': papers['doi'],
+            'openalex_id': papers['id'],
+            'search_term': papers['search_term'],
+            'category': papers['category']
+        }).reset_index(drop=True)
+    
+    def _annual_summary(self):
+        """
+        Per-year statistics for tracked papers in the 2020-2025 window
+        Built once per collected paper set and shared by the CSV export and trend chart
+        Returns (tracked papers, summary DataFrame)
+        """
+        if self._summary_for is self.papers:
+            return self._tracked, self._summary_df
+        
+        # Papers in the analysis window that belong to a tracked category
+        papers = self.papers[self.papers['year'].between(2020, 2025)]
+        years = sorted(papers['year'].astype(int).unique())
+        tracked = papers[papers['category'].isin(['core', 'related'])].sort_values('year', kind='stable')
+        
+        # Per-year, per-category aggregates in a single groupby
+        stats = tracked.groupby(['year', 'category']).agg(
+            papers=('id', 'size'),
+            citations=('citation_count', 'sum'),
+            open_access=('open_access', 'sum')
+        ).unstack('category', fill_value=0).reindex(
+            index=years,
+            columns=pd.MultiIndex.from_product([['papers', 'citations', 'open_access'], ['core', 'related']]),
+            fill_value=0
+        )
+        
+        counts = stats['papers'].assign(total=lambda d: d['core'] + d['related'])
+        citations = stats['citations'].assign(total=lambda d: d['core'] + d['related'])
+        open_access = stats['open_access'].assign(total=lambda d: d['core'] + d['related'])
+        nonzero = counts.where(counts > 0)  # Averages and percentages are 0 for empty groups
+        
+        summary_parts = {
+            'papers': counts,
+            'citations': citations,
+            'avg_citations': (citations / nonzero).fillna(0).round(2),
+            'open_access': open_access,
+            'oa_percentage': (open_access / nonzero * 100).fillna(0).round(1)
+        }
+        
+        summary_df = pd.DataFrame({
+            f'{category}_{stat}': frame[category]
+            for stat, frame in summary_parts.items()
+            for category in ['core', 'related', 'total']
+        })
+        summary_df.insert(0, 'year', summary_df.index)
+        summary_df = summary_df.reset_index(drop=True)
+        
+        self._summary_for, self._tracked, self._summary_df = self.papers, tracked, summary_df
+        return tracked, summary_df
+    
+    def save_annual_summary_csvs(self, format='csv'):
         """
         Save detailed annual summary CSV files:
         1. Core energy hub papers by year
         2. Combined core + related papers by year
+        Pass format='parquet' to write Parquet files instead
         """
-        if not self.papers:
+        if self.papers.empty:
             print("❌ No data to create annual summaries")
             return
         
         print(f"\n📊 Creating Annual Summary Reports...")
         
-        # Organize data by year and category
-        annual_data = defaultdict(lambda: {'core': [], 'related': [], 'all': []})
-        
-        for paper in self.papers:
-            year = paper.get('year')
-            category = paper.get('category', 'unknown')
-            
-            if year and isinstance(year, (int, float)) and 2020 <= year <= 2025:
-                year = int(year)
-                annual_data[year]['all'].append(paper)
-                if category in ['core', 'related']:
-                    annual_data[year][category].append(paper)
-        
-        # Create summary statistics
-        summary_stats = []
-        core_papers_detail = []
-        combined_papers_detail = []
-        
-        for year in sorted(annual_data.keys()):
-            year_data = annual_data[year]
-            core_count = len(year_data['core'])
-            related_count = len(year_data['related'])
-            total_count = core_count + related_count
-            
-            # Calculate statistics
-            core_citations = sum(p.get('citation_count', 0) for p in year_data['core'])
-            related_citations = sum(p.get('citation_count', 0) for p in year_data['related'])
-            total_citations = core_citations + related_citations
-            
-            core_avg_citations = core_citations / core_count if core_count > 0 else 0
-            related_avg_citations = related_citations / related_count if related_count > 0 else 0
-            total_avg_citations = total_citations / total_count if total_count > 0 else 0
-            
-            # Count open access papers
-            core_oa = sum(1 for p in year_data['core'] if p.get('open_access', False))
-            related_oa = sum(1 for p in year_data['related'] if p.get('open_access', False))
-            total_oa = core_oa + related_oa
-            
-            # Summary statistics row
-            summary_stats.append({
-                'year': year,
-                'core_papers': core_count,
-                'related_papers': related_count,
-                'total_papers': total_count,
-                'core_citations': core_citations,
-                'related_citations': related_citations,
-                'total_citations': total_citations,
-                'core_avg_citations': round(core_avg_citations, 2),
-                'related_avg_citations': round(related_avg_citations, 2),
-                'total_avg_citations': round(total_avg_citations, 2),
-                'core_open_access': core_oa,
-                'related_open_access': related_oa,
-                'total_open_access': total_oa,
-                'core_oa_percentage': round((core_oa/core_count)*100, 1) if core_count > 0 else 0,
-                'related_oa_percentage': round((related_oa/related_count)*100, 1) if related_count > 0 else 0,
-                'total_oa_percentage': round((total_oa/total_count)*100, 1) if total_count > 0 else 0
-            })
-            
-            # Detailed core papers
-            for paper in year_data['core']:
-                authors = '; '.join([a.get('name', '') for a in paper.get('authors', [])[:5]])  # First 5 authors
-                core_papers_detail.append({
-                    'year': year,
-                    'title': paper.get('title', ''),
-                    'authors': authors,
-                    'venue': paper.get('venue', ''),
-                    'citation_count': paper.get('citation_count', 0),
-                    'open_access': paper.get('open_access', False),
-                    'doi': paper.get('doi', ''),
-                    'openalex_id': paper.get('id', ''),
-                    'search_term': paper.get('search_term', ''),
-                    'category': 'core'
-                })
-            
-            # Detailed combined papers (core + related)
-            for paper in year_data['all']:
-                if paper.get('category') in ['core', 'related']:
-                    authors = '; '.join([a.get('name', '') for a in paper.get('authors', [])[:5]])
-                    combined_papers_detail.append({
-                        'year': year,
-                        'title': paper.get('title', ''),
-                        'authors': authors,
-                        'venue': paper.get('venue', ''),
-                        'citation_count': paper.get('citation_count', 0),
-                        'open_access': paper.get('open_access', False),
-                        'doi': paper.get('doi', ''),
-                        'openalex_id': paper.get('id', ''),
-                        'search_term': paper.get('search_term', ''),
-                        'category': paper.get('category', 'unknown')
-                    })
+        tracked, summary_df = self._annual_summary()
         
         # Save CSV files
         
         # 1. Annual Summary Statistics
-        summary_df = pd.DataFrame(summary_stats)
         summary_filename = 'energy_hub_annual_summary.csv'
-        summary_df.to_csv(summary_filename, index=False)
+        summary_filename = self._write_table(summary_df, summary_filename, format)
         
         # 2. Core Papers Only - Detailed
-        core_df = pd.DataFrame(core_papers_detail)
+        core_df = self._detail_frame(tracked[tracked['category'] == 'core'])
         core_filename = 'energy_hub_core_papers_by_year.csv'
-        core_df.to_csv(core_filename, index=False)
+        core_filename = self._write_table(core_df, core_filename, format)
         
         # 3. Combined Core + Related Papers - Detailed  
-        combined_df = pd.DataFrame(combined_papers_detail)
+        combined_df = self._detail_frame(tracked)
         combined_filename = 'energy_hub_core_plus_related_papers_by_year.csv'
-        combined_df.to_csv(combined_filename, index=False)
+        combined_filename = self._write_table(combined_df, combined_filename, format)
         
         # 4. Create a simple year-count matrix CSV
-        year_count_matrix = []
-        for year in sorted(annual_data.keys()):
-            year_data = annual_data[year]
-            year_count_matrix.append({
-                'year': year,
-                'core_count': len(year_data['core']),
-                'related_count': len(year_data['related']),
-                'total_count': len(year_data['core']) + len(year_data['related'])
-            })
-        
-        matrix_df = pd.DataFrame(year_count_matrix)
+        matrix_df = summary_df[['year', 'core_papers', 'related_papers', 'total_papers']].rename(columns={
+            'core_papers': 'core_count',
+            'related_papers': 'related_count',
+            'total_papers': 'total_count'
+        })
         matrix_filename = 'energy_hub_paper_counts_by_year.csv'
-        matrix_df.to_csv(matrix_filename, index=False)
+        matrix_filename = self._write_table(matrix_df, matrix_filename, format)
         
         # Print summary
         print(f"\n📄 ANNUAL SUMMARY FILES CREATED:")
@@ -518,19 +673,21 @@ class OpenAlexEnergyHubCollector:
         print(f"   3. {combined_filename} - Core + related papers ({len(combined_df)} papers)")
         print(f"   4. {matrix_filename} - Simple year/count matrix")
         
+        # Plain row arrays instead of per-row Series from iterrows/iloc
+        cols = summary_df[['year', 'core_papers', 'related_papers', 'total_papers']].to_numpy(dtype=np.int64)
+        
         print(f"\n📊 PUBLICATION TRENDS:")
-        for _, row in summary_df.iterrows():
-            print(f"   {int(row['year'])}: {int(row['core_papers'])} core, {int(row['related_papers'])} related, {int(row['total_papers'])} total")
+        for year, core, related, total in cols:
+            print(f"   {year}: {core} core, {related} related, {total} total")
         
         # Calculate growth rates
         if len(summary_df) > 1:
             print(f"\n📈 GROWTH ANALYSIS:")
-            for i in range(1, len(summary_df)):
-                prev_total = summary_df.iloc[i-1]['total_papers']
-                curr_total = summary_df.iloc[i]['total_papers']
-                growth = ((curr_total - prev_total) / prev_total * 100) if prev_total > 0 else 0
-                year = int(summary_df.iloc[i]['year'])
-                print(f"   {year}: {growth:+.1f}% growth ({int(prev_total)} → {int(curr_total)} papers)")
+            totals = cols[:, 3]
+            previous = totals[:-1]
+            growth = np.where(previous > 0, (totals[1:] - previous) / np.maximum(previous, 1) * 100, 0)
+            for year, prev_total, curr_total, rate in zip(cols[1:, 0], previous, totals[1:], growth):
+                print(f"   {year}: {rate:+.1f}% growth ({prev_total} → {curr_total} papers)")
         
         return {
             'summary': summary_df,
@@ -541,26 +698,18 @@ class OpenAlexEnergyHubCollector:
     
     def create_publication_trend_chart(self):
         """Create a detailed publication trend visualization"""
-        if not self.papers:
+        if self.papers.empty:
             print("❌ No data for trend chart")
             return
         
-        # Prepare data
-        annual_data = defaultdict(lambda: {'core': 0, 'related': 0})
-        
-        for paper in self.papers:
-            year = paper.get('year')
-            category = paper.get('category', 'unknown')
-            
-            if year and isinstance(year, (int, float)) and 2020 <= year <= 2025:
-                year = int(year)
-                if category in ['core', 'related']:
-                    annual_data[year][category] += 1
+        # Prepare data - reuses the annual summary, plotting years with tracked papers
+        _, summary_df = self._annual_summary()
+        annual_data = summary_df[summary_df['total_papers'] > 0]
         
-        years = sorted(annual_data.keys())
-        core_counts = [annual_data[year]['core'] for year in years]
-        related_counts = [annual_data[year]['related'] for year in years]
-        total_counts = [core_counts[i] + related_counts[i] for i in range(len(years))]
+        years = annual_data['year'].to_numpy(dtype=np.int64)
+        core_counts = annual_data['core_papers'].to_numpy(dtype=np.int64)
+        related_counts = annual_data['related_papers'].to_numpy(dtype=np.int64)
+        total_counts = core_counts + related_counts
         
         # Create comprehensive visualization
         fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
@@ -593,16 +742,12 @@ class OpenAlexEnergyHubCollector:
         ax2.legend()
         ax2.grid(True, alpha=0.3)
         
-        # Plot 3: Growth rates
-        growth_rates = []
-        for i in range(1, len(total_counts)):
-            if total_counts[i-1] > 0:
-                growth = ((total_counts[i] - total_counts[i-1]) / total_counts[i-1]) * 100
-                growth_rates.append(growth)
-            else:
-                growth_rates.append(0)
+        # Plot 3: Growth rates (0 where the previous year had no papers)
+        previous = total_counts[:-1]
+        growth_rates = np.divide(np.diff(total_counts), previous, out=np.zeros(len(previous)),
+                                 where=previous > 0) * 100
         
-        if growth_rates:
+        if len(growth_rates):
             colors = ['green' if x >= 0 else 'red' for x in growth_rates]
             bars = ax3.bar(years[1:], growth_rates, color=colors, alpha=0.7)
             ax3.set_title('Year-over-Year Growth Rate', fontweight='bold')
@@ -618,8 +763,8 @@ class OpenAlexEnergyHubCollector:
                         f'{rate:.1f}%', ha='center', va='bottom' if rate >= 0 else 'top')
         
         # Plot 4: Cumulative publications
-        cumulative_total = [sum(total_counts[:i+1]) for i in range(len(total_counts))]
-        cumulative_core = [sum(core_counts[:i+1]) for i in range(len(core_counts))]
+        cumulative_total = total_counts.cumsum()
+        cumulative_core = core_counts.cumsum()
         
         ax4.plot(years, cumulative_total, 'o-', linewidth=4, markersize=10, color='purple', label='Total Cumulative')
         ax4.plot(years, cumulative_core, 's-', linewidth=3, markersize=8, color='darkgreen', label='Core Cumulative')
@@ -643,16 +788,20 @@ class OpenAlexEnergyHubCollector:
         
         return years, core_counts, related_counts, total_counts
 
-def run_openalex_collection():
+def _prompt_email(prompt="Enter your email for faster API responses: "):
+    """Ask for a contact email when running in a terminal, otherwise use the placeholder"""
+    email = input(prompt).strip() if sys.stdin.isatty() else ''
+    return email or "researcher@example.com"
+
+def run_openalex_collection(use_cache=True, email=None):
     """Run basic OpenAlex collection (original function)"""
-    email = input("Enter your email for faster API responses: ").strip()
-    if not email:
-        email = "researcher@example.com"
+    if email is None:
+        email = _prompt_email()
     
-    collector = OpenAlexEnergyHubCollector(email=email)
+    collector = OpenAlexEnergyHubCollector(email=email, use_cache=use_cache)
     papers = collector.collect_all_papers()
     
-    if papers:
+    if not papers.empty:
         collector.create_visualization()
         df = collector.save_to_csv()
         print(f"\n✅ Basic collection complete: {len(papers)} papers")
@@ -660,20 +809,19 @@ def run_openalex_collection():
     else:
         print("❌ No papers collected")
         return None, None
-def run_complete_analysis():
+def run_complete_analysis(use_cache=True, email=None):
     """Run complete OpenAlex analysis with all CSV outputs"""
-    email = input("Enter your email for faster API responses: ").strip()
-    if not email:
-        email = "researcher@example.com"
+    if email is None:
+        email = _prompt_email()
     
     print(f"\n🚀 Starting Complete Energy Hub Analysis...")
-    collector = OpenAlexEnergyHubCollector(email=email)
+    collector = OpenAlexEnergyHubCollector(email=email, use_cache=use_cache)
     
     # Step 1: Collect papers
     print(f"\n📚 Step 1: Collecting papers from OpenAlex...")
     papers = collector.collect_all_papers()
     
-    if not papers:
+    if papers.empty:
         print("❌ No papers collected. Exiting.")
         return None, None
     
@@ -702,12 +850,11 @@ def run_complete_analysis():
     print(f"   • openalex_energy_hub_analysis.png")
     print(f"   • energy_hub_publication_trends.png")
     
-    # Quick stats
-    if annual_reports:
-        summary_df = annual_reports['summary']
-        total_papers = summary_df['total_papers'].sum()
-        total_core = summary_df['core_papers'].sum()
-        total_related = summary_df['related_papers'].sum()
+    # Quick stats (skipped when no tracked papers fall in the analysis window)
+    summary_df = annual_reports['summary'] if annual_reports else pd.DataFrame()
+    if not summary_df.empty:
+        total_core, total_related, total_papers = summary_df[
+            ['core_papers', 'related_papers', 'total_papers']].sum().to_numpy(dtype=np.int64)
         
         print(f"\n📈 Key Statistics:")
         print(f"   • Total core papers: {total_core}")
@@ -716,24 +863,56 @@ def run_complete_analysis():
         print(f"   • Average papers per year: {total_papers/len(summary_df):.1f}")
         
         # Find peak year
-        peak_year_idx = summary_df['total_papers'].idxmax()
-        peak_year = summary_df.loc[peak_year_idx, 'year']
-        peak_count = summary_df.loc[peak_year_idx, 'total_papers']
+        years = summary_df['year'].to_numpy(dtype=np.int64)
+        totals = summary_df['total_papers'].to_numpy(dtype=np.int64)
+        peak_i = totals.argmax()
+        peak_year, peak_count = years[peak_i], totals[peak_i]
         print(f"   • Peak publication year: {peak_year:.0f} ({peak_count:.0f} papers)")
     
     print(f"="*60)
     
     return collector, annual_reports
 
-def create_research_summary_report():
+# Column widths of the report's annual statistics table (left-aligned)
+_TABLE_WIDTHS = {'Year': 6, 'Core': 6, 'Related': 8, 'Total': 6, 'Growth': 8, 'Citations': 10}
+
+# Fixed closing sections of the research summary report; only the retrieval date varies
+_STATIC_REPORT_FOOTER = """METHODOLOGY:
+---------------
+• Database: OpenAlex comprehensive scholarly database
+• Search Strategy: Multi-term approach covering:
+  - Core terms: 'energy hub', 'energy hubs', 'energy hub optimization'
+  - Related terms: 'multi-energy system', 'integrated energy system'
+• Search Fields: Title and abstract
+• Time Period: 2020-2025
+• Deduplication: Based on OpenAlex IDs and title matching
+
+LIMITATIONS:
+-------------
+• OpenAlex coverage may not include all energy hub publications
+• Search limited to English-language metadata
+• 2025 data represents partial year only
+• Citation counts may lag for recent publications
+
+RECOMMENDED CITATION:
+--------------------
+Data retrieved from OpenAlex (https://openalex.org/) on {date}. 
+OpenAlex is developed by OurResearch and provides open access to scholarly metadata.
+
+================================================================================
+"""
+
+def create_research_summary_report(use_cache=True, email=None):
     """Create a formatted research summary for your mini review paper"""
-    email = input("Enter your email: ").strip() or "researcher@example.com"
+    if email is None:
+        email = _prompt_email("Enter your email: ")
     
-    collector = OpenAlexEnergyHubCollector(email=email)
+    collector = OpenAlexEnergyHubCollector(email=email, use_cache=use_cache)
     papers = collector.collect_all_papers()
     
-    if not papers:
-        return
+    if papers.empty:
+        print("❌ No papers collected - no report written")
+        return None
     
     # Generate all reports
     annual_reports = collector.save_annual_summary_csvs()
@@ -741,124 +920,89 @@ def create_research_summary_report():
     # Create a formatted summary for academic use
     report_filename = 'energy_hub_research_summary_report.txt'
     
-    with open(report_filename, 'w', encoding='utf-8') as f:
-        f.write("="*80 + "\n")
-        f.write("           ENERGY HUB RESEARCH BIBLIOMETRIC ANALYSIS\n")
-        f.write("                    (OpenAlex Database)\n")
-        f.write("="*80 + "\n\n")
-        
-        f.write(f"ANALYSIS DATE: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"DATA SOURCE: OpenAlex (https://openalex.org/)\n")
-        f.write(f"SEARCH PERIOD: 2020-2025\n")
-        f.write(f"TOTAL PAPERS COLLECTED: {len(papers)}\n\n")
-        
-        if annual_reports:
-            summary_df = annual_reports['summary']
-            
-            f.write("ANNUAL PUBLICATION STATISTICS:\n")
-            f.write("-" * 50 + "\n")
-            f.write(f"{'Year':<6} {'Core':<6} {'Related':<8} {'Total':<6} {'Growth':<8} {'Citations':<10}\n")
-            f.write("-" * 50 + "\n")
-            
-            for i, row in summary_df.iterrows():
-                if i > 0:
-                    prev_total = summary_df.iloc[i-1]['total_papers']
-                    growth = ((row['total_papers'] - prev_total) / prev_total * 100) if prev_total > 0 else 0
-                    growth_str = f"{growth:+5.1f}%"
-                else:
-                    growth_str = "  -   "
-                
-                f.write(f"{int(row['year']):<6} {int(row['core_papers']):<6} {int(row['related_papers']):<8} "
-                       f"{int(row['total_papers']):<6} {growth_str:<8} {int(row['total_citations']):<10}\n")
-            
-            f.write("\nKEY FINDINGS:\n")
-            f.write("-" * 20 + "\n")
-            
-            total_papers = summary_df['total_papers'].sum()
-            total_core = summary_df['core_papers'].sum()
-            total_related = summary_df['related_papers'].sum()
-            
-            f.write(f"• Research Focus Distribution:\n")
-            f.write(f"  - Core energy hub research: {total_core} papers ({total_core/total_papers*100:.1f}%)\n")
-            f.write(f"  - Related multi-energy research: {total_related} papers ({total_related/total_papers*100:.1f}%)\n\n")
-            
-            f.write(f"• Publication Growth:\n")
-            first_year_total = summary_df.iloc[0]['total_papers']
-            last_year_total = summary_df.iloc[-1]['total_papers']
-            overall_growth = ((last_year_total - first_year_total) / first_year_total * 100) if first_year_total > 0 else 0
-            f.write(f"  - Overall growth: {overall_growth:+.1f}% from {summary_df.iloc[0]['year']:.0f} to {summary_df.iloc[-1]['year']:.0f}\n")
-            f.write(f"  - Average annual publications: {total_papers/len(summary_df):.1f} papers\n\n")
-            
-            f.write(f"• Citation Impact:\n")
-            total_citations = summary_df['total_citations'].sum()
-            avg_citations = total_citations / total_papers if total_papers > 0 else 0
-            f.write(f"  - Total citations: {int(total_citations)}\n")
-            f.write(f"  - Average citations per paper: {avg_citations:.1f}\n\n")
-            
-            peak_year_idx = summary_df['total_papers'].idxmax()
-            peak_year = summary_df.loc[peak_year_idx, 'year']
-            peak_count = summary_df.loc[peak_year_idx, 'total_papers']
-            f.write(f"• Peak Publication Year: {peak_year:.0f} ({peak_count:.0f} papers)\n\n")
-            
-        f.write("METHODOLOGY:\n")
-        f.write("-" * 15 + "\n")
-        f.write("• Database: OpenAlex comprehensive scholarly database\n")
-        f.write("• Search Strategy: Multi-term approach covering:\n")
-        f.write("  - Core terms: 'energy hub', 'energy hubs', 'energy hub optimization'\n")
-        f.write("  - Related terms: 'multi-energy system', 'integrated energy system'\n")
-        f.write("• Search Fields: Title and abstract\n")
-        f.write("• Time Period: 2020-2025\n")
-        f.write("• Deduplication: Based on OpenAlex IDs and title matching\n\n")
-        
-        f.write("LIMITATIONS:\n")
-        f.write("-" * 13 + "\n")
-        f.write("• OpenAlex coverage may not include all energy hub publications\n")
-        f.write("• Search limited to English-language metadata\n")
-        f.write("• 2025 data represents partial year only\n")
-        f.write("• Citation counts may lag for recent publications\n\n")
-        
-        f.write("RECOMMENDED CITATION:\n")
-        f.write("-" * 20 + "\n")
-        f.write("Data retrieved from OpenAlex (https://openalex.org/) on ")
-        f.write(f"{datetime.now().strftime('%Y-%m-%d')}. \n")
-        f.write("OpenAlex is developed by OurResearch and provides open access to scholarly metadata.\n\n")
-        
-        f.write("="*80 + "\n")
+    # Build the whole report in memory and write it in one call
+    now = datetime.now()
+    stamp_full = now.strftime('%Y-%m-%d %H:%M:%S')
+    stamp_date = now.strftime('%Y-%m-%d')
+    parts = []
+    parts.append("="*80 + "\n")
+    parts.append("           ENERGY HUB RESEARCH BIBLIOMETRIC ANALYSIS\n")
+    parts.append("                    (OpenAlex Database)\n")
+    parts.append("="*80 + "\n\n")
     
-    print(f"\n📋 Research summary report created: {report_filename}")
-    print(f"   This file contains a formatted summary suitable for your mini review paper.")
+    parts.append(f"ANALYSIS DATE: {stamp_full}\n")
+    parts.append(f"DATA SOURCE: OpenAlex (https://openalex.org/)\n")
+    parts.append(f"SEARCH PERIOD: 2020-2025\n")
+    parts.append(f"TOTAL PAPERS COLLECTED: {len(papers)}\n\n")
     
-    return annual_reports
-    """Run OpenAlex collection with your email"""
-    email = input("Enter your email for faster API responses: ").strip()
-    if not email:
-        email = "researcher@example.com"  # Default
+    # Statistics need at least one tracked paper in the analysis window
+    summary_df = annual_reports['summary'] if annual_reports else pd.DataFrame()
+    if not summary_df.empty:
+        parts.append("ANNUAL PUBLICATION STATISTICS:\n")
+        parts.append("-" * 50 + "\n")
+        
+        # Pull each column out once and compute year-over-year growth for all rows at once
+        years = summary_df['year'].astype(int).to_numpy()
+        core = summary_df['core_papers'].to_numpy(dtype=np.int64)
+        related = summary_df['related_papers'].to_numpy(dtype=np.int64)
+        totals = summary_df['total_papers'].to_numpy(dtype=np.int64)
+        citations = summary_df['total_citations'].to_numpy(dtype=np.int64)
+        # No previous-year papers counts as no growth; the first year has none to compare.
+        # Clamping the divisor to 1 keeps the division safe without a per-row branch.
+        prev = np.roll(totals, 1)
+        prev[0] = 0
+        growth = np.where(prev > 0, (totals - prev) / np.maximum(prev, 1) * 100.0, 0.0)
+        growth[0] = np.nan
+        
+        growth_strs = ["  -   " if np.isnan(g) else f"{g:+5.1f}%" for g in growth]
+        
+        # Pad each cell to its column width on its own, so an oversized value only shifts its row
+        widths = list(_TABLE_WIDTHS.values())
+        header = ' '.join(name.ljust(width) for name, width in _TABLE_WIDTHS.items())
+        rows = [' '.join(f"{cell:<{width}}" for cell, width in zip(cells, widths))
+                for cells in zip(years.tolist(), core.tolist(), related.tolist(), totals.tolist(),
+                                 growth_strs, citations.tolist())]
+        parts.append(header + "\n" + "-" * 50 + "\n" + "\n".join(rows) + "\n")
+        
+        parts.append("\nKEY FINDINGS:\n")
+        parts.append("-" * 20 + "\n")
+        
+        # One aggregation pass for every total used below
+        total_core, total_related, total_papers, total_citations = summary_df[
+            ['core_papers', 'related_papers', 'total_papers', 'total_citations']].sum().to_numpy(dtype=np.int64)
+        
+        parts.append(f"• Research Focus Distribution:\n")
+        parts.append(f"  - Core energy hub research: {total_core} papers ({total_core/total_papers*100:.1f}%)\n")
+        parts.append(f"  - Related multi-energy research: {total_related} papers ({total_related/total_papers*100:.1f}%)\n\n")
+        
+        parts.append(f"• Publication Growth:\n")
+        first_year_total, last_year_total = totals[0], totals[-1]
+        overall_growth = ((last_year_total - first_year_total) / first_year_total * 100) if first_year_total > 0 else 0
+        parts.append(f"  - Overall growth: {overall_growth:+.1f}% from {years[0]:.0f} to {years[-1]:.0f}\n")
+        parts.append(f"  - Average annual publications: {total_papers/len(summary_df):.1f} papers\n\n")
+        
+        parts.append(f"• Citation Impact:\n")
+        avg_citations = total_citations / total_papers if total_papers > 0 else 0
+        parts.append(f"  - Total citations: {int(total_citations)}\n")
+        parts.append(f"  - Average citations per paper: {avg_citations:.1f}\n\n")
+        
+        peak_i = totals.argmax()
+        peak_year, peak_count = years[peak_i], totals[peak_i]
+        parts.append(f"• Peak Publication Year: {peak_year:.0f} ({peak_count:.0f} papers)\n\n")
+        
+    parts.append(_STATIC_REPORT_FOOTER.format(date=stamp_date))
     
-    collector = OpenAlexEnergyHubCollector(email=email)
+    with open(report_filename, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.write(''.join(parts))
     
-    # Collect papers
-    papers = collector.collect_all_papers()
+    print(f"\n📋 Research summary report created: {report_filename}")
+    print(f"   This file contains a formatted summary suitable for your mini review paper.")
     
-    if papers:
-        # Create visualization
-        collector.create_visualization()
-        
-        # Save to CSV
-        df = collector.save_to_csv()
-        
-        print(f"\n✅ SUCCESS!")
-        print(f"   Papers collected: {len(papers)}")
-        print(f"   Visualization: openalex_energy_hub_analysis.png")
-        print(f"   Data: openalex_energy_hub_papers.csv")
-        
-        return collector, df
-    else:
-        print("❌ No papers collected")
-        return None, None
+    return annual_reports
 
-def quick_openalex_test():
+def quick_openalex_test(use_cache=True):
     """Quick test with a single search term"""
-    collector = OpenAlexEnergyHubCollector()
+    collector = OpenAlexEnergyHubCollector(use_cache=use_cache)
     
     # Test with one term
     papers = collector.search_works("energy hub", "core", 2020, 2025)
@@ -866,23 +1010,34 @@ def quick_openalex_test():
     print(f"\n🧪 QUICK TEST RESULTS:")
     print(f"   Found {len(papers)} papers for 'energy hub'")
     
-    if papers:
-        recent_papers = [p for p in papers if p.get('year', 0) >= 2023]
+    if not papers.empty:
+        recent_papers = papers[papers['year'] >= 2023]
         print(f"   Recent papers (2023+): {len(recent_papers)}")
         
-        if recent_papers:
+        if not recent_papers.empty:
             print(f"\n📋 Sample recent papers:")
-            for i, paper in enumerate(recent_papers[:3]):
+            for i, paper in enumerate(recent_papers.head(3).to_dict('records')):
                 print(f"   {i+1}. {paper.get('title', 'No title')[:80]}...")
                 print(f"      Year: {paper.get('year')}, Citations: {paper.get('citation_count', 0)}")
     
     return papers
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Collect and analyze energy hub literature from OpenAlex")
+    parser.add_argument('--mode', choices=['full', 'summary', 'basic', 'test'],
+                        help="analysis to run (prompts when omitted in a terminal, otherwise 'full')")
+    parser.add_argument('--email', help="contact email sent to OpenAlex (prompts when omitted in a terminal)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="fetch fresh API responses instead of using the local cache (e.g. in CI)")
+    args = parser.parse_args()
+    use_cache = not args.no_cache
+    
     print("OpenAlex Energy Hub Research Collector")
     print("=" * 50)
     
-    choice = input("""
+    mode = args.mode
+    if mode is None and sys.stdin.isatty():
+        choice = input("""
 Choose analysis option:
 1. Complete analysis (recommended) - All CSV files + charts
 2. Research summary report - Formatted for academic use  
@@ -890,15 +1045,16 @@ Choose analysis option:
 4. Quick test - Test functionality
 
 Enter choice (1-4): """).strip()
+        mode = {'1': 'full', '2': 'summary', '3': 'basic', '4': 'test'}.get(choice)
+        if mode is None:
+            print("Invalid choice. Running complete analysis...")
+    mode = mode or 'full'
     
-    if choice == '1':
-        collector, reports = run_complete_analysis()
-    elif choice == '2':
-        reports = create_research_summary_report()
-    elif choice == '3':
-        collector, df = run_openalex_collection()
-    elif choice == '4':
-        papers = quick_openalex_test()
+    if mode == 'full':
+        collector, reports = run_complete_analysis(use_cache, args.email)
+    elif mode == 'summary':
+        reports = create_research_summary_report(use_cache, args.email)
+    elif mode == 'basic':
+        collector, df = run_openalex_collection(use_cache, args.email)
     else:
-        print("Invalid choice. Running complete analysis...")
-        collector, reports = run_complete_analysis()
\ No newline at end of file
+        papers = quick_openalex_test(use_cache)
\ No newline at end of file